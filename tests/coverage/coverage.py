@@ -1,135 +1,137 @@
 # SPDX-License-Identifier: Apache-2.0
 import json
-from collections import defaultdict
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from operator import countOf
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from tests.coverage.case_file_parser import load_all_testcases
 from tests.coverage.extensions import Extension, error, FunctionRegistry
 
 
-class FunctionTestCoverage:
-    function_name: str
+@dataclass(slots=True)
+class FunctionVariantCoverage:
+    signature: str
     test_count: int
-    function_variant_coverage: defaultdict[str, int]
 
-    def __init__(self, function_name):
-        self.function_name = function_name
-        self.test_count = 0
-        self.function_variant_coverage = defaultdict(int)
 
-    def update_coverage(self, function_variant, count):
-        self.function_variant_coverage[function_variant] += count
-        self.test_count += count
+@dataclass(slots=True)
+class FunctionTestCoverage:
+    function_name: str
+    test_count: int = 0
+    variants: list[FunctionVariantCoverage] = field(default_factory=list)
 
-    def to_dict(self):
-        return {
-            "function_name": self.function_name,
-            "test_count": self.test_count,
-            "variants": [
-                {"signature": variant, "test_count": count}
-                for variant, count in self.function_variant_coverage.items()
-            ],
-        }
+    def update_coverage(self, signature, count):
+        self.variants.append(FunctionVariantCoverage(signature, count))
+        self.test_count += count
 
 
+@dataclass(slots=True)
 class FileTestCoverage:
     file_name: str
-    test_count: int
-    function_coverage: dict[str, FunctionTestCoverage]
+    test_count: int = 0
+    function_coverage: list[FunctionTestCoverage] = field(default_factory=list)
 
-    def __init__(self, file_name):
-        self.file_name = file_name
-        self.test_count = 0
-        self.function_coverage = dict()
-
-    def update_coverage(self, func_name, args, count):
-        key = f"{func_name}({', '.join(args)})"
-        if func_name not in self.function_coverage:
-            self.function_coverage[func_name] = FunctionTestCoverage(func_name)
-        self.function_coverage[func_name].update_coverage(key, count)
-        self.test_count += count
-
-    def to_dict(self):
-        return {
-            "file_name": self.file_name,
-            "test_count": self.test_count,
-            "function_coverage": [
-                func_coverage.to_dict()
-                for func_name, func_coverage in self.function_coverage.items()
-            ],
-        }
+    def add_function_coverage(self, func_name):
+        function_coverage = FunctionTestCoverage(func_name)
+        self.function_coverage.append(function_coverage)
+        return function_coverage
 
 
 class TestCoverage:
-    file_coverage: dict[str, FileTestCoverage]
+    __slots__ = (
+        "ext_uris",
+        "function_variant_coverage",
+        "test_count",
+        "num_tests_with_no_matching_function",
+        "num_covered_function_variants",
+        "total_function_variants",
+    )
+
+    ext_uris: set[str]
+    function_variant_coverage: Counter[tuple[str, str, str]]
     test_count: int
     num_tests_with_no_matching_function: int
     num_covered_function_variants: int
     total_function_variants: int
 
     def __init__(self, ext_uris):
-        self.file_coverage = dict()
+        self.ext_uris = set(ext_uris)
+        self.function_variant_coverage = Counter()
         self.test_count = 0
         self.num_tests_with_no_matching_function = 0
         self.num_covered_function_variants = 0
         self.total_function_variants = 0
-        for ext_uri in ext_uris:
-            self.file_coverage[ext_uri] = FileTestCoverage(ext_uri)
 
-    def update_coverage(self, ext_uri, function, args, count):
-        if ext_uri not in self.file_coverage:
-            self.file_coverage[ext_uri] = FileTestCoverage(ext_uri)
-        self.file_coverage[ext_uri].update_coverage(function, args, count)
+    def update_coverage(self, ext_uri, function, signature, count):
+        self.function_variant_coverage[(ext_uri, function, signature)] += count
         self.test_count += count
 
     def compute_coverage(self):
-        for file_coverage in self.file_coverage.values():
-            for function_coverage in file_coverage.function_coverage.values():
-                for test_count in function_coverage.function_variant_coverage.values():
-                    if test_count > 0:
-                        self.num_covered_function_variants += 1
-                    self.total_function_variants += 1
-
-    def to_dict(self):
-        return {
-            "file_coverage": [
-                file_coverage.to_dict() for file_coverage in self.file_coverage.values()
-            ],
+        test_counts = self.function_variant_coverage.values()
+        self.total_function_variants = len(test_counts)
+        self.num_covered_function_variants = self.total_function_variants - countOf(
+            test_counts, 0
+        )
+
+    def get_file_coverage(self):
+        # nested per-file view of the coverage, only needed for serialization
+        file_coverage = dict()
+        function_coverage = dict()
+        for variant, count in self.function_variant_coverage.items():
+            ext_uri, function, signature = variant
+            if ext_uri not in file_coverage:
+                file_coverage[ext_uri] = FileTestCoverage(ext_uri)
+            ext_coverage = file_coverage[ext_uri]
+            ext_coverage.test_count += count
+            function_key = (ext_uri, function)
+            if function_key not in function_coverage:
+                function_coverage[function_key] = ext_coverage.add_function_coverage(
+                    function
+                )
+            function_coverage[function_key].update_coverage(signature, count)
+        # extension files without any function variants are still reported, sorted
+        # since the known uris are an unordered set
+        for ext_uri in sorted(self.ext_uris):
+            if ext_uri not in file_coverage:
+                file_coverage[ext_uri] = FileTestCoverage(ext_uri)
+        return file_coverage
+
+    def to_json(self):
+        # the coverage dataclasses are serialized as is, without to_dict copies
+        report = {
+            "file_coverage": list(self.get_file_coverage().values()),
             "test_count": self.test_count,
             "num_tests_with_no_matching_function": self.num_tests_with_no_matching_function,
             "num_covered_function_variants": self.num_covered_function_variants,
             "total_function_variants": self.total_function_variants,
         }
-
-    def to_json(self):
-        return json.dumps(self.to_dict(), indent=2)
+        if orjson is None:
+            return json.dumps(report, indent=2, default=asdict)
+        return orjson.dumps(report, option=orjson.OPT_INDENT_2).decode()
 
 
 def update_test_count(test_case_files: list, function_registry: FunctionRegistry):
     num_tests_with_no_matching_function = 0
+    get_function = function_registry.get_function
     for test_file in test_case_files:
+        include = test_file.include
         for test_case in test_file.testcases:
-            function_variant = function_registry.get_function(
+            function_variant = get_function(
                 test_case.func_name,
-                test_file.include,
-                test_case.get_arg_types(),
-                test_case.get_return_type(),
+                include,
+                test_case.arg_types,
+                test_case.return_type,
             )
+            # get_function already skips variants whose return type doesn't match
             if function_variant:
-                if (
-                    not test_case.is_return_type_error()
-                    and not function_registry.is_same_type(
-                        function_variant.return_type, test_case.get_return_type()
-                    )
-                ):
-                    error(
-                        f"Return type mismatch in function {test_case.get_signature()}: "
-                        f"{function_variant.return_type} != {test_case.get_return_type()}"
-                    )
-                    num_tests_with_no_matching_function += 1
-                    continue
                 function_variant.increment_test_count()
             else:
-                error(f"Function not found: {test_case.get_signature()}")
+                error(f"Function not found: {test_case.signature}")
                 num_tests_with_no_matching_function += 1
     return num_tests_with_no_matching_function
 
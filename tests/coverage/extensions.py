@@ -1,5 +1,8 @@
 # SPDX-License-Identifier: Apache-2.0
+import functools
 import os
+import sys
+from types import MappingProxyType
 import yaml
 
 from tests.coverage.antlr_parser.FuncTestCaseLexer import FuncTestCaseLexer
@@ -12,15 +15,18 @@ def error(msg):
     print(f"ERROR: {msg}")
 
 
-def debug(msg):
+# debug messages take printf-style args, formatted only when debugging is enabled
+def debug(msg, *args):
     if enable_debug:
-        print(f"DEBUG: {msg}")
+        print(f"DEBUG: {msg % args if args else msg}")
 
 
 def substrait_type_str(rule_num):
     return FuncTestCaseLexer.symbolicNames[rule_num].lower()
 
 
+# the mapping is fixed, so it is built once and shared as a read-only view
+@functools.cache
 def build_type_to_short_type():
     rule_map = {
         FuncTestCaseLexer.I8: FuncTestCaseLexer.I8,
@@ -56,7 +62,7 @@ def build_type_to_short_type():
     any_type = substrait_type_str(FuncTestCaseLexer.Any)
     for i in range(1, 3):
         to_short_type[f"{any_type}{i}"] = f"{any_type}{i}"
-    return to_short_type
+    return MappingProxyType(to_short_type)
 
 
 type_to_short_type = build_type_to_short_type()
@@ -112,7 +118,10 @@ class Extension:
                         args.append(Extension.get_short_type(arg_type))
                     else:
                         debug(
-                            f"arg is not a value type for function: {func['name']} arg must be enum options {arg['options']}"
+                            "arg is not a value type for function: %s "
+                            "arg must be enum options %s",
+                            func["name"],
+                            arg["options"],
                         )
                         args.append("str")
             overloads.append(
@@ -129,7 +138,11 @@ class Extension:
             name = func["name"]
             if name in function_map:
                 debug(
-                    f"Duplicate function name: {name} renaming to {name}_{suffix} extension: {extension}"
+                    "Duplicate function name: %s renaming to %s_%s extension: %s",
+                    name,
+                    name,
+                    suffix,
+                    extension,
                 )
                 dup_idx += 1
                 name = f"{name}_dup{dup_idx}_{suffix}"
@@ -137,7 +150,9 @@ class Extension:
                     name not in function_map
                 ), f"Duplicate function name: {name} renaming to {name}_{suffix} extension: {extension}"
             func["overloads"] = Extension.get_supported_kernels_from_impls(func)
-            func["uri"] = uri
+            # names and uris become dict keys in the coverage, intern them once here
+            func["name"] = sys.intern(func["name"])
+            func["uri"] = sys.intern(uri)
             func.pop("description", None)
             func.pop("impls", None)
             function_map[name] = func
@@ -215,6 +230,8 @@ class FunctionVariant:
         self.variadic = variadic
         self.func_type = func_type
         self.test_count = 0
+        # coverage key, built once here instead of for every coverage update
+        self.signature = sys.intern(f"{name}({', '.join(args)})")
 
     def __str__(self):
         return f"Function(name={self.name}, uri={self.uri}, description={self.description}, overloads={self.overload}, args={self.args}, result={self.result})"
@@ -251,15 +268,22 @@ class FunctionRegistry:
         self.scalar_functions = scalar_functions
         self.aggregate_functions = aggregate_functions
         self.window_functions = window_functions
+        # variants indexed by (name, uri), kept per registry instance
+        self.uri_registry = dict()
+        # get_function results, cleared whenever functions are added
+        self.function_cache = dict()
         self.add_functions(scalar_functions, FunctionType.SCALAR)
         self.add_functions(aggregate_functions, FunctionType.AGGREGATE)
         self.add_functions(window_functions, FunctionType.WINDOW)
 
     def add_functions(self, functions, func_type):
+        self.function_cache.clear()
         for func in functions.values():
             self.extensions.add(func["uri"])
             f_name = func["name"]
             fun_arr = self.registry.get(f_name, [])
+            # index by (name, uri) so lookups only scan the overloads of one file
+            uri_fun_arr = self.uri_registry.setdefault((f_name, func["uri"]), [])
             for overload in func["overloads"]:
                 function = FunctionVariant(
                     func["name"],
@@ -271,6 +295,7 @@ class FunctionRegistry:
                     func_type,
                 )
                 fun_arr.append(function)
+                uri_fun_arr.append(function)
             self.registry[f_name] = fun_arr
 
     @staticmethod
@@ -287,17 +312,27 @@ class FunctionRegistry:
     def get_function(
         self, name: str, uri: str, args: object, return_type
     ) -> [FunctionVariant]:
-        functions = self.registry.get(name, None)
+        # error results match any return type, and SubstraitError isn't hashable
+        if isinstance(return_type, SubstraitError):
+            return_type = None
+        args = tuple(args)
+        cache_key = (name, uri, args, return_type)
+        if cache_key not in self.function_cache:
+            self.function_cache[cache_key] = self.find_function(
+                name, uri, args, return_type
+            )
+        return self.function_cache[cache_key]
+
+    def find_function(self, name, uri, args, return_type):
+        functions = self.uri_registry.get((name, uri), None)
         if functions is None:
             return None
         for function in functions:
-            if uri != function.uri:
-                continue
-            if not isinstance(return_type, SubstraitError) and not self.is_same_type(
+            if return_type is not None and not self.is_same_type(
                 function.return_type, return_type
             ):
                 continue
-            if function.args == args:
+            if tuple(function.args) == args:
                 return function
             if len(function.args) != len(args) and not (
                 function.variadic and len(args) >= len(function.args)
@@ -320,5 +355,5 @@ class FunctionRegistry:
         for func_name, functions in self.registry.items():
             for function in functions:
                 coverage.update_coverage(
-                    function.uri, func_name, function.args, function.test_count
+                    function.uri, func_name, function.signature, function.test_count
                 )
@@ -47,19 +47,19 @@ class TestCase:
     result: CaseLiteral | str | SubstraitError
     comment: str
 
-    def get_return_type(self):
+    @property
+    def return_type(self):
         if isinstance(self.result, CaseLiteral):
             return self.result.type
         return self.result
 
-    def is_return_type_error(self):
-        return isinstance(self.result, SubstraitError)
+    @property
+    def arg_types(self):
+        return tuple(arg.get_base_type() for arg in self.args)
 
-    def get_arg_types(self):
-        return [arg.get_base_type() for arg in self.args]
-
-    def get_signature(self):
-        return f"{self.func_name}({', '.join([arg.type for arg in self.args])}) = {self.get_return_type()}"
+    @property
+    def signature(self):
+        return f"{self.func_name}({', '.join([arg.type for arg in self.args])}) = {self.return_type}"
 
 
 @dataclass
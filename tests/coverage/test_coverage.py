@@ -1,12 +1,14 @@
 # SPDX-License-Identifier: Apache-2.0
+import json
 import os
 
 import pytest
 from antlr4 import InputStream
 from tests.coverage.case_file_parser import parse_stream, parse_one_file
+from tests.coverage import coverage
 from tests.coverage.extensions import Extension
 from tests.coverage.visitor import ParseError
-from tests.coverage.nodes import CaseLiteral
+from tests.coverage.nodes import CaseLiteral, SubstraitError
 
 
 def parse_string(input_string):
@@ -480,6 +482,24 @@ def test_parse_various_aggregate_scalar_func_argument_types(input_func_test):
         ),
         ("add", ["dec", "dec"], "dec", "/extensions/functions_arithmetic.yaml", True),
         ("max", ["dec", "dec"], "dec", "/extensions/functions_arithmetic.yaml", True),
+        # error results match any return type
+        (
+            "add",
+            ["i8", "i8"],
+            SubstraitError("error"),
+            "/extensions/functions_arithmetic.yaml",
+            False,
+        ),
+        (
+            "add",
+            ["i8", "i8"],
+            SubstraitError("error"),
+            "/extensions/functions_datetime.yaml",
+            True,
+        ),
+        # args may be passed as a tuple as well as a list
+        ("add", ("i8", "i8"), "i8", "/extensions/functions_arithmetic.yaml", False),
+        ("add", ("i8", "str"), "i8", "/extensions/functions_arithmetic.yaml", True),
     ],
 )
 def test_uri_match_in_get_function(
@@ -491,3 +511,67 @@ def test_uri_match_in_get_function(
 
     function = registry.get_function(func_name, func_uri, func_args, func_ret)
     assert (function is None) == expected_failure
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_coverage_to_json(monkeypatch, use_orjson):
+    if use_orjson:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(coverage, "orjson", None)
+
+    test_coverage = coverage.TestCoverage(
+        [
+            "/extensions/functions_empty_z.yaml",
+            "/extensions/functions_a.yaml",
+            "/extensions/functions_empty.yaml",
+        ]
+    )
+    test_coverage.update_coverage("/extensions/functions_a.yaml", "f", "f(i8)", 2)
+    test_coverage.update_coverage("/extensions/functions_a.yaml", "f", "f(i16)", 0)
+    test_coverage.update_coverage("/extensions/functions_b.yaml", "g", "g()", 1)
+    test_coverage.compute_coverage()
+
+    assert json.loads(test_coverage.to_json()) == {
+        "file_coverage": [
+            {
+                "file_name": "/extensions/functions_a.yaml",
+                "test_count": 2,
+                "function_coverage": [
+                    {
+                        "function_name": "f",
+                        "test_count": 2,
+                        "variants": [
+                            {"signature": "f(i8)", "test_count": 2},
+                            {"signature": "f(i16)", "test_count": 0},
+                        ],
+                    }
+                ],
+            },
+            {
+                "file_name": "/extensions/functions_b.yaml",
+                "test_count": 1,
+                "function_coverage": [
+                    {
+                        "function_name": "g",
+                        "test_count": 1,
+                        "variants": [{"signature": "g()", "test_count": 1}],
+                    }
+                ],
+            },
+            {
+                "file_name": "/extensions/functions_empty.yaml",
+                "test_count": 0,
+                "function_coverage": [],
+            },
+            {
+                "file_name": "/extensions/functions_empty_z.yaml",
+                "test_count": 0,
+                "function_coverage": [],
+            },
+        ],
+        "test_count": 3,
+        "num_tests_with_no_matching_function": 0,
+        "num_covered_function_variants": 2,
+        "total_function_variants": 3,
+    }
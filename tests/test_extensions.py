@@ -1,6 +1,8 @@
 # SPDX-License-Identifier: Apache-2.0
 import os
 
+import pytest
+
 from tests.coverage.case_file_parser import load_all_testcases
 from tests.coverage.coverage import get_test_coverage
 from tests.coverage.extensions import build_type_to_short_type
@@ -58,3 +60,10 @@ def test_build_type_to_short_type():
     assert long_to_short["list"] == "list"
     assert long_to_short["map"] == "map"
     assert long_to_short["struct"] == "struct"
+
+
+def test_build_type_to_short_type_is_read_only():
+    long_to_short = build_type_to_short_type()
+    with pytest.raises(TypeError):
+        long_to_short["i64"] = "i32"
+    assert build_type_to_short_type()["i64"] == "i64"